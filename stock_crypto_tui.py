@@ -4,53 +4,323 @@ Stock & Crypto TUI - Terminal User Interface for displaying stock and cryptocurr
 """
 
 import argparse
+import asyncio
+import copy
+import hashlib
 import json
 import os
+import pickle
+import queue
 import sys
+import tempfile
+import threading
+from concurrent.futures import Executor, Future, as_completed
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import yfinance as yf
-from rich.console import Console
+from rich.console import Console, Group
 from rich.table import Table
 from rich.text import Text
 from rich.panel import Panel
+from rich.columns import Columns
+from rich.measure import Measurement
+from rich.screen import Screen
 from rich.layout import Layout
 from rich.align import Align
 from rich import box
 import time
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Map common crypto tickers to CoinGecko IDs
+CRYPTO_MAPPING = {
+    'BTC': 'bitcoin',
+    'ETH': 'ethereum',
+    'ADA': 'cardano',
+    'DOT': 'polkadot',
+    'LINK': 'chainlink',
+    'LTC': 'litecoin',
+    'XRP': 'ripple',
+    'DOGE': 'dogecoin',
+    'SHIB': 'shiba-inu',
+    'MATIC': 'matic-network',
+    'AVAX': 'avalanche-2',
+    'SOL': 'solana',
+    'HBAR': 'hedera-hashgraph',
+}
+
+CRYPTO_TICKERS = frozenset(CRYPTO_MAPPING)
+
+# Changes table columns: (header, key in the ticker's changes dict)
+CHANGE_COLUMNS = (("24h", "24h"), ("7d", "7d"), ("30d", "30d"), ("YTD", "ytd"))
+
+# Default configuration, overridden by values from the config file
+DEFAULT_CONFIG = {
+    "colors": {
+        "positive": "#00FF00",
+        "negative": "#FF0000",
+        "neutral": "#FFFFFF",
+        "ticker": "#00FFFF",
+        "price": "#FFFFFF",
+        "background": "#000000"
+    },
+    "display": {
+        "max_tickers_per_row": 4,
+        "max_tickers": 12,
+        "chart_height": 8,
+        "chart_width": 20,
+        "max_workers": 8,
+        "fetch_timeout": 30
+    },
+    "symbols": {
+        "up": "▲",
+        "down": "▼"
+    },
+    "currency": {
+        "default": "USD",
+        "symbol": "$"
+    },
+    "watch_mode": {
+        "refresh_interval": 30,
+        "prefetch_lead": 10
+    },
+    "cache": {
+        "enabled": True,
+        "directory": "~/.cache/stock-crypto-tui",
+        "history_ttl": 86400,
+        "quote_ttl": 15,
+        "max_age": 604800
+    }
+}
+
+# Placeholder used while building charts as ASCII bytes
+CHART_GLYPHS = str.maketrans({'#': '█'})
+
+def parse_json(response: requests.Response) -> Any:
+    """Decode a JSON response body, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+class ResponseCache:
+    """In-memory TTL cache for API responses, persisted as pickle files on disk
+    
+    Expired entries are fetched again before returning. Callers can opt in to
+    stale-while-revalidate, where an entry expired by less than one more TTL
+    is returned immediately while a background thread fetches a fresh copy.
+    Anything older is fetched synchronously, so a value that was never
+    refreshed (the refresh thread dies with a one-shot run) cannot linger.
+    
+    Entries not written for max_age seconds are pruned from memory and disk.
+    """
+    
+    def __init__(self, directory: Optional[str] = None, enabled: bool = True,
+                 max_age: float = 7 * 86400):
+        self.enabled = enabled
+        self.directory = os.path.expanduser(directory) if directory else None
+        self.max_age = max_age
+        self.entries = {}
+        self.refreshing = set()
+        self.lock = threading.Lock()
+        self.last_pruned = 0.0
+        
+        if self.enabled:
+            self.prune()
+    
+    def get(self, key: str, ttl: float, fetch: Callable[[], Any],
+            stale_while_revalidate: bool = False) -> Any:
+        """Return the cached value for key, calling fetch on a miss"""
+        if not self.enabled:
+            return fetch()
+            
+        entry = self._load(key)
+        if entry is not None:
+            stored_at, value = entry
+            age = time.time() - stored_at
+            if age <= ttl:
+                return value
+            if stale_while_revalidate and age <= 2 * ttl:
+                self._refresh_in_background(key, fetch)
+                return value
+                
+        value = fetch()
+        if value is not None:
+            self._store(key, value)
+        return value
+    
+    def prune(self):
+        """Drop entries older than max_age from memory and disk"""
+        now = time.time()
+        self.last_pruned = now
+        
+        with self.lock:
+            for key in [key for key, (stored_at, _) in self.entries.items()
+                        if now - stored_at > self.max_age]:
+                del self.entries[key]
+                
+        if not self.directory:
+            return
+            
+        try:
+            filenames = os.listdir(self.directory)
+        except OSError:
+            return
+            
+        for filename in filenames:
+            if not filename.endswith(('.pkl', '.tmp')):
+                continue
+            path = os.path.join(self.directory, filename)
+            try:
+                if now - os.path.getmtime(path) > self.max_age:
+                    os.remove(path)
+            except OSError:
+                pass
+    
+    def _path(self, key: str) -> str:
+        """Get the disk location for a cache key"""
+        filename = hashlib.sha1(key.encode('utf-8')).hexdigest() + '.pkl'
+        return os.path.join(self.directory, filename)
+    
+    def _load(self, key: str) -> Optional[Tuple[float, Any]]:
+        """Look a key up in memory, then on disk"""
+        with self.lock:
+            if key in self.entries:
+                return self.entries[key]
+                
+        if not self.directory:
+            return None
+            
+        try:
+            with open(self._path(key), 'rb') as f:
+                entry = pickle.load(f)
+        except Exception:
+            return None
+            
+        with self.lock:
+            self.entries.setdefault(key, entry)
+        return entry
+    
+    def _store(self, key: str, value: Any):
+        """Save a value in memory and on disk"""
+        entry = (time.time(), value)
+        with self.lock:
+            self.entries[key] = entry
+            
+        # Long-running watch sessions prune about once an hour
+        if entry[0] - self.last_pruned > 3600:
+            self.prune()
+            
+        if not self.directory:
+            return
+            
+        # Write to a temporary file first so readers never see a partial entry
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(entry, f)
+            os.replace(tmp_path, self._path(key))
+        except Exception:
+            pass
+    
+    def _refresh_in_background(self, key: str, fetch: Callable[[], Any]):
+        """Fetch a fresh value for a stale key without blocking the caller"""
+        with self.lock:
+            if key in self.refreshing:
+                return
+            self.refreshing.add(key)
+            
+        def refresh():
+            try:
+                value = fetch()
+                if value is not None:
+                    self._store(key, value)
+            except Exception:
+                pass
+            finally:
+                with self.lock:
+                    self.refreshing.discard(key)
+                    
+        threading.Thread(target=refresh, daemon=True).start()
+
+class DaemonThreadPool(Executor):
+    """Run tasks on up to max_workers daemon threads
+    
+    ThreadPoolExecutor's workers are joined when the interpreter exits, so a
+    worker blocked on a hung request keeps the program from exiting until the
+    request times out. Daemon workers don't hold up exit.
+    """
+    
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self.tasks: "queue.SimpleQueue[Optional[Tuple]]" = queue.SimpleQueue()
+        self.threads: List[threading.Thread] = []
+        self.lock = threading.Lock()
+        
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        future: Future = Future()
+        with self.lock:
+            self.tasks.put((future, fn, args, kwargs))
+            if len(self.threads) < self.max_workers:
+                thread = threading.Thread(target=self._work, daemon=True)
+                thread.start()
+                self.threads.append(thread)
+        return future
+    
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False):
+        with self.lock:
+            if cancel_futures:
+                while True:
+                    try:
+                        task = self.tasks.get_nowait()
+                    except queue.Empty:
+                        break
+                    if task is not None:
+                        task[0].cancel()
+            # One stop marker per worker, queued behind any remaining tasks
+            for _ in self.threads:
+                self.tasks.put(None)
+        if wait:
+            for thread in self.threads:
+                thread.join()
+    
+    def _work(self):
+        while True:
+            task = self.tasks.get()
+            if task is None:
+                return
+            future, fn, args, kwargs = task
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+
 class StockCryptoTUI:
     def __init__(self, config_path: str = "config.json"):
         self.console = Console()
+        self.console_lock = threading.Lock()
+        # While set, log messages are collected here instead of printed
+        self.log_buffer: Optional[List[str]] = None
         self.config = self.load_config(config_path)
+        self.session = self.create_session()
+        self.cache = ResponseCache(self.config['cache']['directory'],
+                                   self.config['cache']['enabled'],
+                                   self.config['cache']['max_age'])
         
     def load_config(self, config_path: str) -> Dict:
         """Load configuration from JSON file"""
-        default_config = {
-            "colors": {
-                "positive": "#00FF00",
-                "negative": "#FF0000",
-                "neutral": "#FFFFFF",
-                "ticker": "#00FFFF",
-                "price": "#FFFFFF",
-                "background": "#000000"
-            },
-            "display": {
-                "max_tickers_per_row": 4,
-                "max_tickers": 12,
-                "chart_height": 8,
-                "chart_width": 20
-            },
-            "symbols": {
-                "up": "▲",
-                "down": "▼"
-            },
-            "currency": {
-                "default": "USD",
-                "symbol": "$"
-            }
-        }
+        default_config = copy.deepcopy(DEFAULT_CONFIG)
         
         if os.path.exists(config_path):
             try:
@@ -68,37 +338,161 @@ class StockCryptoTUI:
         
         return default_config
     
-    def get_stock_data(self, ticker: str) -> Optional[Dict]:
-        """Fetch stock data using yfinance"""
+    def create_session(self) -> requests.Session:
+        """Create an HTTP session that reuses connections and retries transient errors"""
+        session = requests.Session()
+        retries = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 502, 503, 504])
+        session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retries))
+        return session
+    
+    def log(self, message: str):
+        """Print a message to the console, safe to call from worker threads
+        
+        In watch mode the messages are buffered and shown with the next frame,
+        so workers never write over the frame on screen.
+        """
+        with self.console_lock:
+            if self.log_buffer is not None:
+                self.log_buffer.append(message)
+            else:
+                self.console.print(message)
+    
+    def take_log_messages(self) -> List[str]:
+        """Return and clear the buffered log messages"""
+        with self.console_lock:
+            messages = self.log_buffer or []
+            if self.log_buffer is not None:
+                self.log_buffer = []
+        return messages
+    
+    def fetch_stock_batch(self, tickers: List[str]) -> Dict[str, Any]:
+        """Fetch three months of price history for several stocks in one yfinance download"""
+        symbols = sorted({ticker.upper() for ticker in tickers})
+        if not symbols:
+            return {}
+            
+        def fetch():
+            hist_all = yf.download(symbols, period="3mo", group_by='ticker',
+                                   threads=True, progress=False)
+            # Don't cache failed downloads
+            return None if hist_all.empty else hist_all
+        
         try:
-            stock = yf.Ticker(ticker)
-            info = stock.info
-            hist = stock.history(period="1y")
+            hist_all = self.cache.get(f"stock-batch-history:{','.join(symbols)}",
+                                      self.config['cache']['quote_ttl'],
+                                      fetch)
+            if hist_all is None:
+                return {}
+            return self.split_stock_batch(hist_all, tickers)
+        except Exception as e:
+            self.log(f"[red]Error fetching stock history: {e}[/red]")
+            return {}
+    
+    def fetch_stock_ytd_bases(self, tickers: List[str], now: Optional[datetime] = None) -> Dict[str, float]:
+        """Fetch each stock's first close of the current year in one yfinance download"""
+        symbols = sorted({ticker.upper() for ticker in tickers})
+        if not symbols:
+            return {}
+            
+        # The first trading day falls within the first two weeks of January
+        year = (now or datetime.now()).year
+        
+        def fetch():
+            hist_all = yf.download(symbols, start=f"{year}-01-01", end=f"{year}-01-15",
+                                   group_by='ticker', threads=True, progress=False)
+            # Don't cache failed downloads
+            return None if hist_all.empty else hist_all
+        
+        try:
+            hist_all = self.cache.get(f"stock-batch-ytd:{','.join(symbols)}:{year}",
+                                      self.config['cache']['history_ttl'],
+                                      fetch)
+            if hist_all is None:
+                return {}
+            return {ticker: float(hist['Close'].iloc[0])
+                    for ticker, hist in self.split_stock_batch(hist_all, tickers).items()
+                    if not hist.empty}
+        except Exception as e:
+            self.log(f"[red]Error fetching stock YTD prices: {e}[/red]")
+            return {}
+    
+    def fetch_stock_batches(self, tickers: List[str],
+                            now: Optional[datetime] = None) -> Tuple[Dict[str, Any], Dict[str, float]]:
+        """Fetch the batched stock histories and YTD prices one after the other
+        
+        yf.download keeps its results in module-level state that each call
+        resets, so two downloads running at once can pick up each other's frames.
+        """
+        histories = self.fetch_stock_batch(tickers)
+        ytd_bases = self.fetch_stock_ytd_bases(tickers, now)
+        
+        # Tickers missing from the batch fall back to their own history
+        # download; retry their YTD prices here once rather than in each worker
+        missing = [ticker for ticker in tickers if ticker not in histories and ticker not in ytd_bases]
+        if missing:
+            ytd_bases.update(self.fetch_stock_ytd_bases(missing, now))
+        return histories, ytd_bases
+    
+    def split_stock_batch(self, hist_all, tickers: List[str]) -> Dict[str, Any]:
+        """Split a multi-ticker yfinance download into per-ticker histories"""
+        histories = {}
+        for ticker in tickers:
+            symbol = ticker.upper()
+            if isinstance(hist_all.columns, pd.MultiIndex):
+                if symbol not in hist_all.columns.get_level_values(0):
+                    continue
+                hist = hist_all[symbol]
+            else:
+                hist = hist_all
+            # Rows are aligned across all tickers, drop dates this one didn't trade
+            histories[ticker] = hist.dropna(subset=['Close'])
+        return histories
+    
+    def prepare_history(self, hist):
+        """Store closing prices as float32, plenty of precision for the chart and changes"""
+        return hist.astype({'Close': 'float32'})
+    
+    def get_stock_data(self, ticker: str, hist=None, now: Optional[datetime] = None,
+                       ytd_base: Optional[float] = None) -> Optional[Dict]:
+        """Fetch stock data using yfinance
+        
+        hist and ytd_base are the ticker's entries from fetch_stock_batches; when
+        hist is omitted the history is downloaded for this ticker alone.
+        """
+        now = now or datetime.now()
+        try:
+            if hist is None:
+                def fetch_history():
+                    hist = yf.Ticker(ticker).history(period="3mo")
+                    # Don't cache failed downloads
+                    return None if hist.empty else hist
+                
+                hist = self.cache.get(f"stock-history:{ticker.upper()}",
+                                      self.config['cache']['quote_ttl'],
+                                      fetch_history)
+                if hist is None:
+                    self.log(f"[yellow]No historical data available for {ticker}[/yellow]")
+                    return None
             
             if hist.empty:
-                self.console.print(f"[yellow]No historical data available for {ticker}[/yellow]")
+                self.log(f"[yellow]No historical data available for {ticker}[/yellow]")
                 return None
                 
-            # Get current price - try multiple sources
-            current_price = None
-            if 'currentPrice' in info and info['currentPrice'] is not None:
-                current_price = info['currentPrice']
-            elif 'regularMarketPrice' in info and info['regularMarketPrice'] is not None:
-                current_price = info['regularMarketPrice']
-            elif 'previousClose' in info and info['previousClose'] is not None:
-                current_price = info['previousClose']
-            else:
-                current_price = hist['Close'].iloc[-1]
+            # The latest close is the live price while the market is open. Read
+            # it at full precision before the history is narrowed to float32
+            current_price = float(hist['Close'].iloc[-1])
             
-            if current_price is None or current_price <= 0:
-                self.console.print(f"[yellow]Invalid price data for {ticker}[/yellow]")
+            if current_price <= 0:
+                self.log(f"[yellow]Invalid price data for {ticker}[/yellow]")
                 return None
             
+            hist = self.prepare_history(hist)
+            
             # Calculate percentage changes
-            changes = self.calculate_changes(hist, current_price)
+            changes = self.calculate_changes(hist, current_price, now, ytd_base)
             
             # Get Friday data for chart (last 3 months)
-            friday_data = self.get_friday_data(hist)
+            friday_data = self.get_friday_data(hist, now)
             
             return {
                 'ticker': ticker.upper(),
@@ -109,66 +503,82 @@ class StockCryptoTUI:
             }
             
         except Exception as e:
-            self.console.print(f"[red]Error fetching stock data for {ticker}: {e}[/red]")
+            self.log(f"[red]Error fetching stock data for {ticker}: {e}[/red]")
             return None
     
-    def get_crypto_data(self, ticker: str) -> Optional[Dict]:
-        """Fetch cryptocurrency data using CoinGecko API"""
-        try:
-            # Map common crypto tickers to CoinGecko IDs
-            crypto_mapping = {
-                'BTC': 'bitcoin',
-                'ETH': 'ethereum',
-                'ADA': 'cardano',
-                'DOT': 'polkadot',
-                'LINK': 'chainlink',
-                'LTC': 'litecoin',
-                'XRP': 'ripple',
-                'DOGE': 'dogecoin',
-                'SHIB': 'shiba-inu',
-                'MATIC': 'matic-network',
-                'AVAX': 'avalanche-2',
-                'SOL': 'solana',
-                'HBAR': 'hedera-hashgraph',
-            }
-            
-            coin_id = crypto_mapping.get(ticker.upper(), ticker.lower())
-            
-            # Get current data
-            currency = self.config['currency']['default'].lower()
-            url = f"https://api.coingecko.com/api/v3/simple/price"
+    def fetch_crypto_batch(self, tickers: List[str]) -> Dict[str, Dict]:
+        """Fetch current price data for several cryptocurrencies in one CoinGecko request"""
+        coin_ids = {ticker: CRYPTO_MAPPING.get(ticker.upper(), ticker.lower()) for ticker in tickers}
+        if not coin_ids:
+            return {}
+        
+        currency = self.config['currency']['default'].lower()
+        ids = ','.join(sorted(set(coin_ids.values())))
+        
+        def fetch():
+            url = "https://api.coingecko.com/api/v3/simple/price"
             params = {
-                'ids': coin_id,
+                'ids': ids,
                 'vs_currencies': currency,
                 'include_24hr_change': 'true',
                 'include_7d_change': 'true',
                 'include_30d_change': 'true'
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = self.session.get(url, params=params, timeout=10)
             response.raise_for_status()
-            data = response.json()
+            return parse_json(response)
+        
+        try:
+            data = self.cache.get(f"crypto-quote:{currency}:{ids}",
+                                  self.config['cache']['quote_ttl'],
+                                  fetch)
+        except Exception as e:
+            self.log(f"[red]Error fetching crypto prices: {e}[/red]")
+            return {}
+        
+        return {ticker: data[coin_id] for ticker, coin_id in coin_ids.items() if coin_id in data}
+    
+    def get_crypto_data(self, ticker: str, coin_data: Optional[Dict] = None,
+                        now: Optional[datetime] = None) -> Optional[Dict]:
+        """Fetch cryptocurrency data using CoinGecko API
+        
+        coin_data is the ticker's entry from fetch_crypto_batch; when omitted the
+        current price is fetched for this ticker alone.
+        """
+        now = now or datetime.now()
+        try:
+            coin_id = CRYPTO_MAPPING.get(ticker.upper(), ticker.lower())
+            currency = self.config['currency']['default'].lower()
             
-            if coin_id not in data:
-                return None
+            # Get current data
+            if coin_data is None:
+                coin_data = self.fetch_crypto_batch([ticker]).get(ticker)
+                if coin_data is None:
+                    return None
                 
-            coin_data = data[coin_id]
             current_price = coin_data[currency]
             
             # Get historical data for YTD and chart
-            hist_url = f"https://api.coingecko.com/api/v3/coins/{coin_id}/market_chart"
-            hist_params = {
-                'vs_currency': currency,
-                'days': '365',
-                'interval': 'daily'
-            }
+            def fetch_history():
+                hist_url = f"https://api.coingecko.com/api/v3/coins/{coin_id}/market_chart"
+                hist_params = {
+                    'vs_currency': currency,
+                    'days': '365',
+                    'interval': 'daily'
+                }
+                
+                hist_response = self.session.get(hist_url, params=hist_params, timeout=10)
+                hist_response.raise_for_status()
+                return parse_json(hist_response)
             
-            hist_response = requests.get(hist_url, params=hist_params, timeout=10)
-            hist_response.raise_for_status()
-            hist_data = hist_response.json()
+            hist_data = self.cache.get(f"crypto-history:{coin_id}:{currency}",
+                                       self.config['cache']['history_ttl'],
+                                       fetch_history,
+                                       stale_while_revalidate=True)
             
             # Calculate YTD change
-            ytd_change = self.calculate_ytd_change(hist_data['prices'], current_price)
+            ytd_change = self.calculate_ytd_change(hist_data['prices'], current_price, now)
             
             changes = {
                 '24h': coin_data.get(f'{currency}_24h_change', 0),
@@ -178,7 +588,7 @@ class StockCryptoTUI:
             }
             
             # Get Friday data for chart
-            friday_data = self.get_crypto_friday_data(hist_data['prices'])
+            friday_data = self.get_crypto_friday_data(hist_data['prices'], now)
             
             return {
                 'ticker': ticker.upper(),
@@ -189,138 +599,125 @@ class StockCryptoTUI:
             }
             
         except Exception as e:
-            self.console.print(f"[red]Error fetching crypto data for {ticker}: {e}[/red]")
+            self.log(f"[red]Error fetching crypto data for {ticker}: {e}[/red]")
             return None
     
-    def calculate_changes(self, hist_data, current_price: float) -> Dict:
-        """Calculate percentage changes for different time periods"""
+    def calculate_changes(self, hist_data, current_price: float, now: Optional[datetime] = None,
+                          ytd_base: Optional[float] = None) -> Dict:
+        """Calculate percentage changes for different time periods
+        
+        ytd_base is the first close of the year; when omitted it is looked up in
+        hist_data. If hist_data doesn't reach back to the start of the year the
+        YTD change is None rather than a change over a shorter window.
+        """
         if hist_data.empty:
             return {'24h': 0, '7d': 0, '30d': 0, 'ytd': 0}
         
-        changes = {}
+        close = hist_data['Close'].to_numpy()
         
-        # 24h change
-        if len(hist_data) >= 2:
-            changes['24h'] = ((current_price - hist_data['Close'].iloc[-2]) / hist_data['Close'].iloc[-2]) * 100
-        else:
-            changes['24h'] = 0
-            
-        # 7d change
-        if len(hist_data) >= 7:
-            changes['7d'] = ((current_price - hist_data['Close'].iloc[-8]) / hist_data['Close'].iloc[-8]) * 100
-        else:
-            changes['7d'] = 0
-            
-        # 30d change
-        if len(hist_data) >= 30:
-            changes['30d'] = ((current_price - hist_data['Close'].iloc[-31]) / hist_data['Close'].iloc[-31]) * 100
-        else:
-            changes['30d'] = 0
-            
-        # YTD change
-        current_year = datetime.now().year
-        ytd_data = hist_data[hist_data.index.year == current_year]
-        if not ytd_data.empty:
-            changes['ytd'] = ((current_price - ytd_data['Close'].iloc[0]) / ytd_data['Close'].iloc[0]) * 100
+        # Percentage change against the close 1, 7 and 30 trading days back
+        changes = {
+            period: ((current_price / close[-offset]) - 1) * 100 if len(close) >= offset else 0
+            for period, offset in (('24h', 2), ('7d', 8), ('30d', 31))
+        }
+        
+        # YTD change; the history only holds the year's first close if it also
+        # has rows from before the year started
+        year_start_price = ytd_base
+        if year_start_price is None:
+            ytd_close = hist_data['Close'].loc[f"{(now or datetime.now()).year}-01-01":]
+            if 0 < len(ytd_close) < len(close):
+                year_start_price = ytd_close.iloc[0]
+                
+        if year_start_price is not None:
+            changes['ytd'] = ((current_price / year_start_price) - 1) * 100
         else:
-            # If no data for current year, use the first available data point
-            if not hist_data.empty:
-                changes['ytd'] = ((current_price - hist_data['Close'].iloc[0]) / hist_data['Close'].iloc[0]) * 100
-            else:
-                changes['ytd'] = 0
+            changes['ytd'] = None
             
         return changes
     
-    def calculate_ytd_change(self, price_data: List, current_price: float) -> float:
+    def calculate_ytd_change(self, price_data: List, current_price: float, now: Optional[datetime] = None) -> float:
         """Calculate YTD change for crypto"""
         if not price_data:
             return 0
             
-        current_year = datetime.now().year
+        current_year = (now or datetime.now()).year
         year_start = datetime(current_year, 1, 1).timestamp() * 1000
         
-        # Find the first price data point of the current year
-        year_start_price = None
-        for timestamp, price in price_data:
-            if timestamp >= year_start:
-                year_start_price = price
-                break
-                
-        if year_start_price is None:
+        # Timestamps are sorted, binary search for the first point of the year
+        prices = np.asarray(price_data, dtype=float)
+        index = np.searchsorted(prices[:, 0], year_start)
+        if index >= len(prices):
             return 0
             
-        return ((current_price - year_start_price) / year_start_price) * 100
+        year_start_price = prices[index, 1]
+        return ((current_price / year_start_price) - 1) * 100
     
-    def get_friday_data(self, hist_data) -> List[float]:
+    def get_friday_data(self, hist_data, now: Optional[datetime] = None) -> List[float]:
         """Get Friday closing prices for the last 3 months"""
         if hist_data.empty:
             return []
             
         try:
-            # Get last 3 months of data
-            three_months_ago = datetime.now() - timedelta(days=90)
-            recent_data = hist_data[hist_data.index >= three_months_ago]
+            close = hist_data['Close']
+            
+            # Get last 3 months of data; the index is sorted so binary search
+            # for the cutoff instead of masking the whole year
+            three_months_ago = pd.Timestamp((now or datetime.now()) - timedelta(days=90))
+            if close.index.tz is not None:
+                three_months_ago = three_months_ago.tz_localize(close.index.tz)
+            recent_close = close.iloc[close.index.searchsorted(three_months_ago):]
             
             # Filter for Fridays (weekday 4)
-            friday_data = recent_data[recent_data.index.weekday == 4]
+            friday_close = recent_close[recent_close.index.weekday == 4]
             
             # Return the last 12 Friday prices (approximately 3 months)
-            if not friday_data.empty:
-                return friday_data['Close'].tail(12).tolist()
+            if not friday_close.empty:
+                return friday_close.tail(12).tolist()
             else:
                 # If no Fridays found, return recent data points
-                return recent_data['Close'].tail(12).tolist()
+                return recent_close.tail(12).tolist()
         except Exception:
             # Fallback: return recent data points
             return hist_data['Close'].tail(12).tolist()
     
-    def get_crypto_friday_data(self, price_data: List) -> List[float]:
+    def get_crypto_friday_data(self, price_data: List, now: Optional[datetime] = None) -> List[float]:
         """Get Friday prices for crypto (approximate)"""
         if not price_data:
             return []
             
         # Get last 3 months of data
-        three_months_ago = datetime.now() - timedelta(days=90)
+        three_months_ago = (now or datetime.now()) - timedelta(days=90)
         three_months_ago_ts = three_months_ago.timestamp() * 1000
         
-        recent_data = [(ts, price) for ts, price in price_data if ts >= three_months_ago_ts]
+        prices = np.asarray(price_data, dtype=float)
+        start = np.searchsorted(prices[:, 0], three_months_ago_ts)
         
-        # Sample every 7th data point to approximate weekly data
-        friday_data = []
-        for i in range(0, len(recent_data), 7):
-            if len(friday_data) < 12:  # Limit to 12 data points
-                friday_data.append(recent_data[i][1])
-                
-        return friday_data
+        # Sample every 7th data point to approximate weekly data, limited to 12 points
+        return prices[start::7, 1][:12].tolist()
     
     def create_ascii_chart(self, data: List[float], width: int = 20, height: int = 8) -> str:
         """Create ASCII chart from price data"""
         if not data or len(data) < 2:
             return "No data"
             
-        min_price = min(data)
-        max_price = max(data)
+        prices = np.asarray(data, dtype=float)
+        min_price = np.min(prices)
+        max_price = np.max(prices)
         price_range = max_price - min_price
         
         if price_range == 0:
             return "─" * width
             
-        chart_lines = []
+        # Row i is filled wherever the price reaches that row's threshold
+        thresholds = max_price - price_range * np.arange(height) / height
+        mask = prices[None, :] >= thresholds[:, None]
         
-        # Create each line of the chart
-        for i in range(height):
-            line = ""
-            threshold = max_price - (price_range * i / height)
-            
-            for price in data:
-                if price >= threshold:
-                    line += "█"
-                else:
-                    line += " "
-                    
-            chart_lines.append(line)
-            
-        return "\n".join(reversed(chart_lines))
+        # Render into one ASCII buffer with a trailing newline column, then
+        # swap the placeholder for the block glyph in a single pass
+        buffer = np.full((height, len(prices) + 1), ord("\n"), dtype=np.uint8)
+        buffer[:, :-1] = np.where(mask[::-1], ord("#"), ord(" "))
+        return buffer.tobytes()[:-1].decode("ascii").translate(CHART_GLYPHS)
     
     def format_price(self, price: float) -> str:
         """Format price with appropriate decimal places"""
@@ -332,9 +729,11 @@ class StockCryptoTUI:
         else:
             return f"{currency_symbol}{price:.4f}"
     
-    def format_change(self, change: float) -> Tuple[str, str]:
+    def format_change(self, change: Optional[float]) -> Tuple[str, str]:
         """Format percentage change with color and symbol"""
-        if change > 0:
+        if change is None:
+            return "n/a", self.config['colors']['neutral']
+        elif change > 0:
             color = self.config['colors']['positive']
             symbol = self.config['symbols']['up']
         elif change < 0:
@@ -347,8 +746,8 @@ class StockCryptoTUI:
         formatted_change = f"{symbol}{abs(change):.2f}%"
         return formatted_change, color
     
-    def create_ticker_panel(self, data: Dict) -> Panel:
-        """Create a panel for a single ticker"""
+    def create_ticker_panel(self, data: Dict, chart_height: Optional[int] = None) -> Panel:
+        """Create a panel for a single ticker, optionally overriding the chart height"""
         # Ticker symbol
         ticker_text = Text(data['ticker'], style=self.config['colors']['ticker'])
         
@@ -358,13 +757,9 @@ class StockCryptoTUI:
         
         # Changes table
         changes_table = Table(show_header=True, header_style="bold magenta", box=box.SIMPLE)
-        changes_table.add_column("24h", justify="center")
-        changes_table.add_column("7d", justify="center")
-        changes_table.add_column("30d", justify="center")
-        changes_table.add_column("YTD", justify="center")
-        
         row_data = []
-        for period in ['24h', '7d', '30d', 'ytd']:
+        for header, period in CHANGE_COLUMNS:
+            changes_table.add_column(header, justify="center")
             change, color = self.format_change(data['changes'][period])
             row_data.append(Text(change, style=color))
             
@@ -373,21 +768,10 @@ class StockCryptoTUI:
         # ASCII chart
         chart = self.create_ascii_chart(data['friday_data'], 
                                       self.config['display']['chart_width'],
-                                      self.config['display']['chart_height'])
+                                      chart_height or self.config['display']['chart_height'])
         
-        # Create a simple text-based content
-        content = f"{ticker_text}\n{price_text}\n\n"
-        
-        # Add table as rendered text
-        from io import StringIO
-        import sys
-        old_stdout = sys.stdout
-        sys.stdout = buffer = StringIO()
-        self.console.print(changes_table)
-        sys.stdout = old_stdout
-        table_text = buffer.getvalue()
-        
-        content += table_text + "\n" + chart
+        # Stack the header, changes table and chart into one renderable
+        content = Group(ticker_text, price_text, Text(""), changes_table, Text(chart))
         
         return Panel(
             content,
@@ -396,53 +780,209 @@ class StockCryptoTUI:
             padding=(1, 1)
         )
     
-    def display_grid(self, tickers: List[str]):
-        """Display tickers in a grid layout"""
-        self.console.clear()
+    def fetch_data(self, tickers: List[str]) -> Dict[str, Optional[Dict]]:
+        """Fetch data for all tickers, keyed by ticker"""
+        # Use one reference time for every ticker so the frame is consistent
+        now = datetime.now()
+        
+        # Fetch concurrently; the work is network bound. The whole refresh is
+        # bounded by fetch_timeout so one hung request can't stall the frame
+        max_workers = self.config['display'].get('max_workers', 8)
+        deadline = time.monotonic() + self.config['display']['fetch_timeout']
+        crypto_tickers = [ticker for ticker in tickers if ticker.upper() in CRYPTO_TICKERS]
+        stock_tickers = [ticker for ticker in tickers if ticker.upper() not in CRYPTO_TICKERS]
         
-        # Fetch data for all tickers
+        results = {}
+        executor = DaemonThreadPool(max_workers)
+        try:
+            # The crypto and stock batches don't depend on each other, run them together
+            crypto_future = executor.submit(self.fetch_crypto_batch, crypto_tickers)
+            stock_future = executor.submit(self.fetch_stock_batches, stock_tickers, now)
+            crypto_prices = self.wait_for_batch(crypto_future, deadline, "crypto prices")
+            stock_batches = self.wait_for_batch(stock_future, deadline, "stock history")
+            
+            futures = {}
+            for ticker in tickers:
+                if ticker.upper() in CRYPTO_TICKERS:
+                    if crypto_prices is None or ticker not in crypto_prices:
+                        results[ticker] = None
+                        continue
+                    futures[executor.submit(self.get_crypto_data, ticker, crypto_prices[ticker], now)] = ticker
+                else:
+                    # Past the deadline already, don't start per-ticker downloads
+                    if stock_batches is None:
+                        results[ticker] = None
+                        continue
+                    stock_histories, stock_ytd_bases = stock_batches
+                    futures[executor.submit(self.get_stock_data, ticker, stock_histories.get(ticker), now,
+                                            stock_ytd_bases.get(ticker))] = ticker
+            
+            try:
+                for future in as_completed(futures, timeout=max(deadline - time.monotonic(), 0)):
+                    ticker = futures[future]
+                    try:
+                        results[ticker] = future.result()
+                    except Exception as e:
+                        self.log(f"[red]Error fetching data for {ticker}: {e}[/red]")
+                        results[ticker] = None
+            except FuturesTimeoutError:
+                for future, ticker in futures.items():
+                    if not future.done():
+                        future.cancel()
+                        self.log(f"[red]Timed out fetching data for {ticker}[/red]")
+                        results[ticker] = None
+        finally:
+            # Don't wait on requests that are still hanging
+            executor.shutdown(wait=False)
+                    
+        return results
+    
+    def wait_for_batch(self, future: Future, deadline: float, description: str) -> Optional[Any]:
+        """Get a batch fetch result, or None if the deadline passes first"""
+        try:
+            return future.result(timeout=max(deadline - time.monotonic(), 0))
+        except FuturesTimeoutError:
+            future.cancel()
+            self.log(f"[red]Timed out fetching {description}[/red]")
+            return None
+    
+    def display_grid(self, tickers: List[str], results: Optional[Dict[str, Optional[Dict]]] = None):
+        """Display tickers in a grid layout, fetching their data unless already given"""
+        if results is None:
+            self.console.clear()
+            results = self.fetch_data(tickers)
+            
+        self.console.print(self.build_renderable(tickers, results))
+    
+    def build_renderable(self, tickers: List[str], results: Dict[str, Optional[Dict]],
+                         log_messages: Sequence[str] = (), chart_height: Optional[int] = None) -> Group:
+        """Build the full display for one refresh: log messages and fetch failures
+        followed by the grid"""
+        messages = [Text.from_markup(message) for message in log_messages]
+        
+        # Keep the order the tickers were requested in
         data_list = []
         for ticker in tickers:
-            if ticker.upper() in ['BTC', 'ETH', 'ADA', 'DOT', 'LINK', 'LTC', 'XRP', 'DOGE', 'SHIB', 'MATIC', 'AVAX', 'SOL']:
-                data = self.get_crypto_data(ticker)
-            else:
-                data = self.get_stock_data(ticker)
-                
+            data = results.get(ticker)
             if data:
                 data_list.append(data)
             else:
-                self.console.print(f"[red]Failed to fetch data for {ticker}[/red]")
+                messages.append(Text.from_markup(f"[red]Failed to fetch data for {ticker}[/red]"))
         
         if not data_list:
-            self.console.print("[red]No data available for any tickers[/red]")
-            return
+            messages.append(Text.from_markup("[red]No data available for any tickers[/red]"))
+            return Group(*messages)
         
         # Create grid layout
-        max_per_row = self.config['display']['max_tickers_per_row']
-        panels = []
+        panels = [self.create_ticker_panel(data, chart_height) for data in data_list]
+        return Group(*messages, self.create_grid(panels))
+    
+    def fit_renderable(self, tickers: List[str], results: Dict[str, Optional[Dict]],
+                       log_messages: Sequence[str] = ()) -> Optional[Group]:
+        """Build the display with the tallest charts that fit the terminal height
         
-        for data in data_list:
-            panels.append(self.create_ticker_panel(data))
+        Returns None if the grid is too tall even with one-line charts.
+        """
+        for chart_height in range(self.config['display']['chart_height'], 0, -1):
+            renderable = self.build_renderable(tickers, results, log_messages, chart_height)
+            lines = self.console.render_lines(renderable, self.console.options, pad=False)
+            if len(lines) <= self.console.height:
+                return renderable
+        return None
+    
+    def create_grid(self, panels: List[Panel]) -> Columns:
+        """Arrange panels in rows of at most max_tickers_per_row, rendered in one pass
         
-        # Display in rows
-        for i in range(0, len(panels), max_per_row):
-            row_panels = panels[i:i + max_per_row]
-            self.console.print(*row_panels)
-            self.console.print()  # Empty line between rows
+        Narrow terminals get fewer panels per row rather than panels squeezed
+        below their natural width, which would truncate the changes table.
+        """
+        max_per_row = self.config['display']['max_tickers_per_row']
+        panel_width = max(Measurement.get(self.console, self.console.options, panel).maximum
+                          for panel in panels)
+        
+        # Each column also takes one character of padding on its right
+        per_row = max(min(max_per_row, (self.console.width + 1) // (panel_width + 1)), 1)
+        column_width = max(self.console.width // per_row - 1, 1)
+        for panel in panels:
+            panel.width = column_width
+        return Columns(panels, width=column_width, equal=True, expand=True, padding=(0, 1))
     
-    def run(self, tickers: List[str]):
-        """Main execution function"""
+    def check_ticker_count(self, tickers: List[str]) -> bool:
+        """Check the number of tickers against the configured maximum"""
         if len(tickers) > self.config['display']['max_tickers']:
             self.console.print(f"[red]Maximum {self.config['display']['max_tickers']} tickers allowed[/red]")
+            return False
+        return True
+    
+    def run(self, tickers: List[str]):
+        """Main execution function"""
+        if not self.check_ticker_count(tickers):
             return
             
         self.display_grid(tickers)
+    
+    async def watch(self, tickers: List[str]):
+        """Refresh the display forever on the configured interval"""
+        if not self.check_ticker_count(tickers):
+            return
+            
+        refresh_interval = self.config['watch_mode']['refresh_interval']
+        prefetch_lead = min(self.config['watch_mode']['prefetch_lead'], refresh_interval)
+        loop = asyncio.get_running_loop()
+        
+        # A dedicated daemon executor, so exiting doesn't wait on a fetch in
+        # flight the way asyncio.run waits for the default executor
+        executor = DaemonThreadPool(1)
+        # Worker messages are shown with the next frame instead of over this one
+        self.log_buffer = []
+        alt_screen = False
+        try:
+            # Draw on the alternate screen so each frame overwrites the last in
+            # place instead of clearing and scrolling the terminal
+            self.set_alt_screen(True)
+            alt_screen = True
+            self.console.print(Screen(Text("Fetching data...", style="yellow")), end="")
+            
+            # yfinance and the CoinGecko session are synchronous, run them off the loop
+            results = await loop.run_in_executor(executor, self.fetch_data, tickers)
+            while True:
+                log_messages = self.take_log_messages()
+                frame = self.fit_renderable(tickers, results, log_messages)
+                if frame is not None:
+                    if not alt_screen:
+                        self.set_alt_screen(True)
+                        alt_screen = True
+                    self.console.print(Screen(frame), end="")
+                else:
+                    # The alternate screen would crop the grid, scroll instead
+                    if alt_screen:
+                        self.set_alt_screen(False)
+                        alt_screen = False
+                    self.console.clear()
+                    self.console.print(self.build_renderable(tickers, results, log_messages))
+                
+                # Start fetching the next frame while the current one is still on
+                # screen so the network time is hidden behind the refresh interval
+                await asyncio.sleep(refresh_interval - prefetch_lead)
+                next_frame = loop.run_in_executor(executor, self.fetch_data, tickers)
+                await asyncio.sleep(prefetch_lead)
+                results = await next_frame
+        finally:
+            if alt_screen:
+                self.set_alt_screen(False)
+            self.log_buffer = None
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def set_alt_screen(self, enable: bool):
+        """Switch the alternate screen on or off, hiding the cursor while it is on"""
+        self.console.set_alt_screen(enable)
+        self.console.show_cursor(not enable)
 
 def main():
     parser = argparse.ArgumentParser(description='Stock & Crypto TUI - Terminal display for financial data')
     parser.add_argument('tickers', nargs='+', help='Stock or crypto tickers to display')
     parser.add_argument('--config', '-c', default='config.json', help='Path to configuration file')
-    parser.add_argument('--watch', '-w', action='store_true', help='Watch mode - refresh every 30 seconds')
+    parser.add_argument('--watch', '-w', action='store_true', help='Watch mode - refresh every 30 seconds (see watch_mode.refresh_interval)')
     
     args = parser.parse_args()
     
@@ -450,9 +990,7 @@ def main():
     
     if args.watch:
         try:
-            while True:
-                tui.run(args.tickers)
-                time.sleep(30)
+            asyncio.run(tui.watch(args.tickers))
         except KeyboardInterrupt:
             tui.console.print("\n[yellow]Exiting watch mode...[/yellow]")
     else: